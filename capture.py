@@ -1,255 +1,354 @@
+import argparse
+import sys
 import time
 import datetime
-import yaml
 import os
 import curses
+import shutil
+import signal
+
+from capture_io import (ensure_data_file_exists, handle_sigterm, yaml_codec,
+                        format_task_line, is_legacy_data, parse_manual_times,
+                        make_manual_entry)
 
 FILENAME = "capture-data.yaml"
 
+TITLE_LINE = "--- Time Tracker ---"
+SEP_LINE = "--------------------"
+CMDS_LINE = "Commands: [i]nput task, [s]tart/[s]top stopwatch, [a]dd manual, [q]uit"
+PROMPT_LINE = "Enter command: "
 
-def ensure_data_file_exists(filename):
-    if not os.path.exists(filename):
-        with open(filename, 'w') as f:
-            yaml.dump([], f)
+TICK_MS = 1000
+QUIT_PAUSE_MS = 200
+FLUSH_INTERVAL = 5
+FLUSH_BATCH_SIZE = 8
+WRITE_BUFFER_SIZE = 64 * 1024
 
 
-def load_tasks(filename, stdscr):
+def migrate_legacy_tasks(filename):
+    # Older versions wrote a block-style YAML list. Convert it once to the
+    # one-line layout, keeping the original as a backup; on failure the file
+    # is left untouched.
     try:
-        with open(filename, 'r') as f:
-            return yaml.safe_load(f) or []
+        with open(filename, 'rb') as f:
+            data = f.read()
     except FileNotFoundError:
-        return []
-    except yaml.YAMLError as e:
-        display_message(stdscr, f"Error loading YAML: {e}. Starting empty.")
-        return []
+        return True
+    if not is_legacy_data(data.split(b"\n", 1)[0]):
+        return True
+
+    yaml, SafeLoader = yaml_codec()
+    try:
+        tasks = yaml.load(data, Loader=SafeLoader) or []
+        if not isinstance(tasks, list):
+            raise ValueError("expected a list of tasks")
+        # Hand-written YAML can hold values JSON cannot represent, such as
+        # unquoted timestamps; those raise TypeError here.
+        text = "".join(map(format_task_line, tasks))
+    except (yaml.YAMLError, ValueError, TypeError) as e:
+        print(f"Error converting {filename}: {e}")
+        return False
+
+    backup_filename = filename + ".bak"
+    temp_filename = filename + ".tmp"
+    try:
+        shutil.copy2(filename, backup_filename)
+        with open(temp_filename, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_filename, filename)
+    except OSError as e:
+        print(f"Error converting {filename}: {e}")
+        return False
+    print(f"Converted {filename} to the one-line format. "
+          f"The original is kept as {backup_filename}.")
+    return True
+
+
+def open_task_file(filename, stdscr, state):
+    try:
+        f = open(filename, 'a+', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+        # Each record is a one-line JSON mapping inside a YAML block
+        # sequence, so the file stays a valid YAML list for the analyzer.
+        # Files created by older versions hold the flow-style "[]", which
+        # a block sequence item cannot follow.
+        if f.tell() <= len("[]\n"):
+            f.seek(0)
+            if f.read().strip() in ("", "[]"):
+                f.truncate(0)
+        return f
+    except Exception as e:
+        display_message(stdscr, state, f"Error opening {filename}: {e}")
+        return None
+
+
+def append_tasks(filename, task_entries, stdscr, state):
+    f = open_task_file(filename, stdscr, state)
+    if f is None:
+        return False
+    try:
+        with f:
+            f.write("".join(map(format_task_line, task_entries)))
+    except Exception as e:
+        display_message(stdscr, state, f"Error saving tasks: {e}")
+        return False
+    return True
 
 
-def save_tasks(filename, tasks, stdscr):
+def flush_tasks(stdscr, state, force=False):
+    if not state["unflushed_count"]:
+        return
+    if (not force and state["unflushed_count"] < FLUSH_BATCH_SIZE
+            and time.time() - state["dirty_since"] < FLUSH_INTERVAL):
+        return
+    try:
+        state["data_file"].flush()
+    except Exception as e:
+        display_message(stdscr, state, f"Error saving tasks: {e}")
+    state["unflushed_count"] = 0
+
+
+def record_task(stdscr, state, task_entry):
+    if state["data_file"] is None:
+        display_message(
+            stdscr, state, "Error saving tasks: data file is not open.")
+        return
     try:
-        with open(filename, 'w') as f:
-            yaml.dump(tasks, f, default_flow_style=False)
+        state["data_file"].write(format_task_line(task_entry))
     except Exception as e:
-        display_message(stdscr, f"Error saving tasks: {e}")
+        display_message(stdscr, state, f"Error saving tasks: {e}")
+        return
+    if not state["unflushed_count"]:
+        state["dirty_since"] = time.time()
+    state["unflushed_count"] += 1
+    flush_tasks(stdscr, state)
+
 
+def display_message(stdscr, state, message):
+    if stdscr is None:
+        print(message)
+        return
+
+    state["last_message"] = message
 
-def display_message(stdscr, message):
-    h, w = stdscr.getmaxyx()
+    h, w = state["screen_size"]
     message_line = h - 2
     stdscr.move(message_line, 0)
     stdscr.clrtoeol()
     stdscr.addstr(message_line, 0, message[:w-1])
-    stdscr.refresh()
+    stdscr.noutrefresh()
 
 
-def get_curses_input(stdscr, prompt_line, prompt_col, prompt_text=""):
+def get_curses_input(stdscr, state, prompt_line, prompt_col, prompt_text=""):
     stdscr.move(prompt_line, prompt_col)
     stdscr.clrtoeol()
     stdscr.addstr(prompt_line, prompt_col, prompt_text)
-    stdscr.refresh()
 
-    input_str = []
+    input_col = prompt_col + len(prompt_text)
+    max_len = max(state["screen_size"][1] - input_col - 1, 1)
+
     curses.echo()
     curses.curs_set(1)
+    stdscr.leaveok(False)
+    stdscr.timeout(-1)
 
-    current_col = prompt_col + len(prompt_text)
-    stdscr.move(prompt_line, current_col)
-
-    while True:
-        char_code = stdscr.getch()
-        if char_code == curses.KEY_ENTER or char_code in [10, 13]:
-            break
-        elif char_code == curses.KEY_BACKSPACE or char_code == 127:
-            if input_str:
-                input_str.pop()
-                current_col -= 1
-                stdscr.delch(prompt_line, current_col)
-        elif 32 <= char_code <= 126:
-            if current_col < stdscr.getmaxyx()[1] - 1:
-                input_str.append(chr(char_code))
-                stdscr.addch(prompt_line, current_col, char_code)
-                current_col += 1
-        stdscr.refresh()
+    raw = stdscr.getstr(prompt_line, input_col, max_len)
+    # getstr consumes a KEY_RESIZE itself, so the main loop never sees it.
+    if curses.is_term_resized(*state["screen_size"]):
+        state["screen_size"] = stdscr.getmaxyx()
+        state["static_drawn"] = False
 
+    stdscr.timeout(TICK_MS)
+    stdscr.leaveok(True)
     curses.noecho()
     curses.curs_set(0)
-    return "".join(input_str)
+    return raw.decode('utf-8', 'replace')
 
 
 def is_task_info_valid(task_info):
     return bool(task_info["type"] and task_info["tag"] and task_info["name"])
 
 
-def display_current_status(stdscr, state):
-    h, w = stdscr.getmaxyx()
-
-    for r in range(0, 11):
-        stdscr.move(r, 0)
-        stdscr.clrtoeol()
-
-    stdscr.addstr(0, 0, "--- Time Tracker ---")
+def _fmt_elapsed(seconds):
+    return str(datetime.timedelta(seconds=seconds))
 
-    current_task = state["current_task_info"]
-    stdscr.addstr(2, 0, f"Current Task: Type: {current_task['type'] or 'N/A'}")
-    stdscr.addstr(3, 0, f"              Tag:  {current_task['tag'] or 'N/A'}")
-    stdscr.addstr(4, 0, f"              Name: {current_task['name'] or 'N/A'}")
 
+def format_stopwatch_line(state):
     if state["is_stopwatch_running"]:
         elapsed_time = 0
-        if state["stopwatch_start_time"] is not None:
-            elapsed_time = time.time() - state["stopwatch_start_time"]
-        stdscr.addstr(6, 0, f"Stopwatch: RUNNING ({
-                      datetime.timedelta(seconds=int(elapsed_time))})")
-    else:
-        status_text = "STOPPED"
-        if state["last_saved_duration"] is not None:
-            status_text += f" (Last task: {datetime.timedelta(
-                seconds=int(state['last_saved_duration']))})"
-        stdscr.addstr(6, 0, f"Stopwatch: {status_text}")
+        if state["stopwatch_start_mono"] is not None:
+            elapsed_time = time.monotonic() - state["stopwatch_start_mono"]
+        seconds = int(elapsed_time)
+        if seconds != state["_last_elapsed_int"]:
+            state["_last_elapsed_int"] = seconds
+            state["_last_elapsed_str"] = _fmt_elapsed(seconds)
+        return f"Stopwatch: RUNNING ({state['_last_elapsed_str']})"
+
+    status_text = "STOPPED"
+    if state["last_saved_duration"] is not None:
+        status_text += f" (Last task: {
+            _fmt_elapsed(int(state['last_saved_duration']))})"
+    return f"Stopwatch: {status_text}"
 
-    stdscr.addstr(8, 0, "--------------------")
 
-    stdscr.addstr(
-        9, 0,
-        "Commands: [i]nput task, [s]tart/[s]top stopwatch, [a]dd manual, [q]uit")
+def format_task_block(task_values):
+    task_type, task_tag, task_name = task_values
+    return (f"Current Task: Type: {task_type or 'N/A'}",
+            f"              Tag:  {task_tag or 'N/A'}",
+            f"              Name: {task_name or 'N/A'}")
 
-    for r in range(11, h - 2):
-        stdscr.move(r, 0)
+
+def update_status_lines(stdscr, state):
+    h, w = state["screen_size"]
+
+    current_task = state["current_task_info"]
+    task_values = (current_task["type"], current_task["tag"],
+                   current_task["name"])
+    if task_values != state["rendered_task_block"]:
+        # The embedded newlines clear the rest of the first two rows.
+        stdscr.addstr(2, 0, "\n".join(
+            line[:w-1] for line in format_task_block(task_values)))
         stdscr.clrtoeol()
+        state["rendered_task_block"] = task_values
 
-    stdscr.move(h - 1, 0)
-    stdscr.clrtoeol()
-    stdscr.addstr(h - 1, 0, "Enter command: ")
+    stopwatch_line = format_stopwatch_line(state)
+    if stopwatch_line != state["rendered_stopwatch_line"]:
+        stdscr.move(6, 0)
+        stdscr.clrtoeol()
+        stdscr.addstr(6, 0, stopwatch_line[:w-1])
+        state["rendered_stopwatch_line"] = stopwatch_line
+
+    stdscr.noutrefresh()
+
+
+def display_current_status(stdscr, state):
+    h, w = state["screen_size"]
+
+    frame_lines = [""] * h
+    frame_lines[0] = TITLE_LINE
+    frame_lines[8] = SEP_LINE
+    frame_lines[9] = CMDS_LINE
+    frame_lines[h - 2] = state["last_message"]
+    frame_lines[h - 1] = PROMPT_LINE
+    stdscr.erase()
+    stdscr.addstr(0, 0, "\n".join(line[:w-1] for line in frame_lines))
 
-    stdscr.refresh()
+    state["static_drawn"] = True
+    state["rendered_task_block"] = None
+    state["rendered_stopwatch_line"] = None
+    update_status_lines(stdscr, state)
+
+
+def clear_input_area(stdscr, state, start_line):
+    # One clrtobot for the whole input block; only the message and prompt
+    # rows below it need to be put back.
+    h, w = state["screen_size"]
+    stdscr.move(start_line, 0)
+    stdscr.clrtobot()
+    stdscr.addstr(h - 2, 0, state["last_message"][:w-1])
+    stdscr.addstr(h - 1, 0, PROMPT_LINE)
 
 
 def prompt_for_task_details(stdscr, state):
     if state["is_stopwatch_running"]:
         display_message(
-            stdscr, "Cannot input new task while stopwatch is running. Stop it (s).")
+            stdscr, state, "Cannot input new task while stopwatch is running. Stop it (s).")
         return
 
     input_display_start_line = 12
 
-    for i in range(input_display_start_line, input_display_start_line + 4):
-        stdscr.move(i, 0)
-        stdscr.clrtoeol()
+    clear_input_area(stdscr, state, input_display_start_line)
 
     stdscr.addstr(input_display_start_line, 0,
                   "Enter task details (press Enter after each):")
-    stdscr.refresh()
+    stdscr.noutrefresh()
 
     user_input = get_curses_input(
-        stdscr, input_display_start_line + 1, 0, "Task Type: ").strip()
+        stdscr, state, input_display_start_line + 1, 0, "Task Type: ").strip()
     if user_input:
         state["current_task_info"]["type"] = user_input
 
     user_input = get_curses_input(
-        stdscr, input_display_start_line + 2, 0, "Task Tag: ").strip()
+        stdscr, state, input_display_start_line + 2, 0, "Task Tag: ").strip()
     if user_input:
         state["current_task_info"]["tag"] = user_input
 
     user_input = get_curses_input(
-        stdscr, input_display_start_line + 3, 0, "Task Name: ").strip()
+        stdscr, state, input_display_start_line + 3, 0, "Task Name: ").strip()
     if user_input:
         state["current_task_info"]["name"] = user_input
 
     if not is_task_info_valid(state["current_task_info"]):
         display_message(
-            stdscr, "Warning: Task fields empty. Fill for better tracking.")
+            stdscr, state, "Warning: Task fields empty. Fill for better tracking.")
     else:
-        display_message(stdscr, "Task info updated.")
+        display_message(stdscr, state, "Task info updated.")
 
-    for i in range(input_display_start_line, input_display_start_line + 4):
-        stdscr.move(i, 0)
-        stdscr.clrtoeol()
-    stdscr.refresh()
+    clear_input_area(stdscr, state, input_display_start_line)
+    stdscr.noutrefresh()
 
 
-def handle_stopwatch_toggle(stdscr, state, filename):
+def handle_stopwatch_toggle(stdscr, state):
     if state["is_stopwatch_running"]:
-        end_time = time.time()
-        duration = end_time - state["stopwatch_start_time"]
+        duration = time.monotonic() - state["stopwatch_start_mono"]
+        start_time = state["stopwatch_start_wall"]
+        start_iso = datetime.datetime.fromtimestamp(
+            start_time).isoformat(timespec='milliseconds')
+        end_iso = datetime.datetime.fromtimestamp(
+            start_time + duration).isoformat(timespec='milliseconds')
 
         state["is_stopwatch_running"] = False
-        state["stopwatch_start_time"] = None
+        state["stopwatch_start_mono"] = None
+        state["stopwatch_start_wall"] = None
         state["last_saved_duration"] = duration
 
         task_entry = {
             "type": state["current_task_info"]["type"],
             "tag": state["current_task_info"]["tag"],
             "name": state["current_task_info"]["name"],
-            "start": datetime.datetime.fromtimestamp(end_time - duration).isoformat(timespec='milliseconds'),
-            "end": datetime.datetime.fromtimestamp(end_time).isoformat(timespec='milliseconds'),
+            "start": start_iso,
+            "end": end_iso,
             "duration": round(duration, 3)
         }
-        tasks = load_tasks(filename, stdscr)
-        tasks.append(task_entry)
-        save_tasks(filename, tasks, stdscr)
-        display_message(stdscr, f"Stopwatch stopped. Task {task_entry['type']} {task_entry['tag']} {
-                        task_entry['name']} recorded. Duration: {datetime.timedelta(seconds=int(duration))}")
+        record_task(stdscr, state, task_entry)
+        display_message(stdscr, state, f"Stopwatch stopped. Task {task_entry['type']} {task_entry['tag']} {
+                        task_entry['name']} recorded. Duration: {_fmt_elapsed(int(duration))}")
     else:
         if not is_task_info_valid(state["current_task_info"]):
             display_message(
-                stdscr, "Error: Task info empty. Use 'i' first to set a task.")
+                stdscr, state, "Error: Task info empty. Use 'i' first to set a task.")
             return
 
-        state["stopwatch_start_time"] = time.time()
+        state["stopwatch_start_mono"] = time.monotonic()
+        state["stopwatch_start_wall"] = time.time()
         state["is_stopwatch_running"] = True
-        display_message(stdscr, "Stopwatch started.")
+        display_message(stdscr, state, "Stopwatch started.")
 
 
-def _get_manual_times(stdscr, input_display_start_line):
-    for i in range(input_display_start_line, input_display_start_line + 4):
-        stdscr.move(i, 0)
-        stdscr.clrtoeol()
+def _get_manual_times(stdscr, state, input_display_start_line):
+    clear_input_area(stdscr, state, input_display_start_line)
 
     stdscr.addstr(input_display_start_line, 0,
                   "Enter start and end times for the manual task.")
     stdscr.addstr(input_display_start_line + 1, 0,
                   "Format: YYYY-MM-DD HH:MM (e.g., 2023-10-27 09:00)")
-    stdscr.refresh()
+    stdscr.noutrefresh()
 
     start_str = get_curses_input(
-        stdscr, input_display_start_line + 2, 0, "Start Time: ").strip()
+        stdscr, state, input_display_start_line + 2, 0, "Start Time: ").strip()
     end_str = get_curses_input(
-        stdscr, input_display_start_line + 3, 0, "End Time: ").strip()
+        stdscr, state, input_display_start_line + 3, 0, "End Time: ").strip()
 
-    fmts = ["%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S"]
-    start_dt = None
-    end_dt = None
+    return parse_manual_times(start_str, end_str)
 
-    for fmt in fmts:
-        try:
-            start_dt = datetime.datetime.strptime(start_str, fmt)
-            break
-        except ValueError:
-            pass
-    for fmt in fmts:
-        try:
-            end_dt = datetime.datetime.strptime(end_str, fmt)
-            break
-        except ValueError:
-            pass
 
-    if start_dt is None or end_dt is None:
-        raise ValueError(
-            "Invalid time format. Use YYYY-MM-DD HH:MM or YYYY-MM-DD HH:MM:S.")
-
-    if start_dt >= end_dt:
-        raise ValueError("Start time must be before end time.")
-
-    return start_dt, end_dt
-
-
-def add_manual_entry(stdscr, state, filename):
+def add_manual_entry(stdscr, state):
     if not is_task_info_valid(state["current_task_info"]):
         display_message(
-            stdscr, "Error: Task info empty. Use 'i' first to set a task.")
+            stdscr, state, "Error: Task info empty. Use 'i' first to set a task.")
         return
     if state["is_stopwatch_running"]:
         display_message(
-            stdscr,
+            stdscr, state,
             "Cannot add manual task while stopwatch is running. Stop it (s)."
         )
         return
@@ -257,32 +356,45 @@ def add_manual_entry(stdscr, state, filename):
     input_display_start_line = 12
 
     try:
-        start_dt, end_dt = _get_manual_times(stdscr, input_display_start_line)
-        duration = (end_dt - start_dt).total_seconds()
-
-        task_entry = {
-            "type": state["current_task_info"]["type"],
-            "tag": state["current_task_info"]["tag"],
-            "name": state["current_task_info"]["name"],
-            "start": start_dt.isoformat(timespec='milliseconds'),
-            "end": end_dt.isoformat(timespec='milliseconds'),
-            "duration": round(duration, 3)
-        }
-        tasks = load_tasks(filename, stdscr)
-        tasks.append(task_entry)
-        save_tasks(filename, tasks, stdscr)
-        display_message(stdscr, f"Manual task {task_entry['type']} {
+        start_dt, end_dt = _get_manual_times(
+            stdscr, state, input_display_start_line)
+        task_entry = make_manual_entry(
+            state["current_task_info"], start_dt, end_dt)
+        record_task(stdscr, state, task_entry)
+        display_message(stdscr, state, f"Manual task {task_entry['type']} {
                         task_entry['tag']} {task_entry['name']} added successfully.")
 
     except ValueError as e:
-        display_message(stdscr, f"Error: {e}")
+        display_message(stdscr, state, f"Error: {e}")
     except Exception as e:
-        display_message(stdscr, f"An unexpected error occurred: {e}")
+        display_message(stdscr, state, f"An unexpected error occurred: {e}")
     finally:
-        for i in range(input_display_start_line, input_display_start_line + 4):
-            stdscr.move(i, 0)
-            stdscr.clrtoeol()
-        stdscr.refresh()
+        clear_input_area(stdscr, state, input_display_start_line)
+        stdscr.noutrefresh()
+
+
+def handle_quit(stdscr, state):
+    if state["is_stopwatch_running"]:
+        state["is_stopwatch_running"] = False
+        state["stopwatch_start_mono"] = None
+        state["stopwatch_start_wall"] = None
+        display_message(stdscr, state, "Stopwatch data discarded.")
+        return False
+
+    display_message(stdscr, state, "Quitting program. Goodbye!")
+    curses.doupdate()
+    stdscr.timeout(QUIT_PAUSE_MS)
+    stdscr.getch()
+    return True
+
+
+# Keyed by the lowercase code; uppercase letters map onto it via key | 0x20.
+_DISPATCH = {
+    ord('i'): prompt_for_task_details,
+    ord('s'): handle_stopwatch_toggle,
+    ord('a'): add_manual_entry,
+    ord('q'): handle_quit,
+}
 
 
 def run_tracker_app(stdscr):
@@ -293,51 +405,119 @@ def run_tracker_app(stdscr):
             "name": ""
         },
         "is_stopwatch_running": False,
-        "stopwatch_start_time": None,
+        "stopwatch_start_mono": None,
+        "stopwatch_start_wall": None,
         "last_saved_duration": None,
+        "static_drawn": False,
+        "rendered_task_block": None,
+        "rendered_stopwatch_line": None,
+        "_last_elapsed_int": -1,
+        "_last_elapsed_str": "",
+        "screen_size": stdscr.getmaxyx(),
+        "data_file": None,
+        "unflushed_count": 0,
+        "dirty_since": None,
+        "last_message": "",
     }
 
     curses.noecho()
     curses.cbreak()
     stdscr.nodelay(True)
-    stdscr.timeout(1000)
+    stdscr.timeout(TICK_MS)
+    # The cursor is hidden outside text input, so curses need not move it
+    # back to the prompt after every update.
+    stdscr.leaveok(True)
+    curses.curs_set(0)
 
+    app_state["data_file"] = open_task_file(FILENAME, stdscr, app_state)
     display_current_status(stdscr, app_state)
 
-    while True:
-        key = stdscr.getch()
-
-        if key != -1:
-            command = chr(key).lower()
-
-            if command == 'i':
-                prompt_for_task_details(stdscr, app_state)
-            elif command == 's':
-                handle_stopwatch_toggle(stdscr, app_state, FILENAME)
-            elif command == 'a':
-                add_manual_entry(stdscr, app_state, FILENAME)
-            elif command == 'q':
-                if app_state["is_stopwatch_running"]:
-                    app_state["is_stopwatch_running"] = False
-                    app_state["stopwatch_start_time"] = None
-                    display_message(
-                        stdscr, "Stopwatch data discarded.")
-                    time.sleep(1)
-                else:
-                    display_message(stdscr, "Quitting program. Goodbye!")
-                    time.sleep(1)
+    try:
+        while True:
+            key = stdscr.getch()
+
+            if key == curses.KEY_RESIZE:
+                app_state["screen_size"] = stdscr.getmaxyx()
+                app_state["static_drawn"] = False
+            elif key != -1:
+                handler = _DISPATCH.get(key | 0x20)
+                if handler is None:
+                    display_message(stdscr, app_state, f"Invalid command '{
+                                    chr(key).lower()}'. Use i, s, a, q.")
+                elif handler(stdscr, app_state):
                     break
-            else:
-                display_message(stdscr, f"Invalid command '{
-                                command}'. Use i, s, a, q.")
 
-        display_current_status(stdscr, app_state)
+            if not app_state["static_drawn"]:
+                display_current_status(stdscr, app_state)
+            elif key != -1 or app_state["is_stopwatch_running"]:
+                update_status_lines(stdscr, app_state)
+            flush_tasks(stdscr, app_state)
+            curses.doupdate()
+    finally:
+        if app_state["data_file"] is not None:
+            flush_tasks(stdscr, app_state, force=True)
+            app_state["data_file"].close()
+
+
+def add_manual_entry_headless(args):
+    task_info = {"type": args.type, "tag": args.tag, "name": args.name}
+    if not is_task_info_valid(task_info):
+        print("Error: --type, --tag and --name are required with --add-manual.")
+        return 1
+
+    try:
+        start_dt, end_dt = parse_manual_times(args.start, args.end)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    task_entry = make_manual_entry(task_info, start_dt, end_dt)
+    if not append_tasks(FILENAME, [task_entry], None, None):
+        return 1
+    print(f"Manual task {task_entry['type']} {task_entry['tag']} {
+          task_entry['name']} added successfully.")
+    return 0
+
+
+def run_curses_app():
+    stdscr = curses.initscr()
+    curses.noecho()
+    curses.cbreak()
+    stdscr.keypad(True)
+    try:
+        run_tracker_app(stdscr)
+    finally:
+        stdscr.keypad(False)
+        curses.nocbreak()
+        curses.echo()
+        curses.endwin()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Capture time spent on tasks.")
+    parser.add_argument("--add-manual", action="store_true",
+                        help="record one manual entry without starting the UI")
+    parser.add_argument("--type", default="")
+    parser.add_argument("--tag", default="")
+    parser.add_argument("--name", default="")
+    parser.add_argument("--start", default="",
+                        help="start time, YYYY-MM-DD HH:MM[:SS]")
+    parser.add_argument("--end", default="",
+                        help="end time, YYYY-MM-DD HH:MM[:SS]")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
+    args = parse_args()
     ensure_data_file_exists(FILENAME)
+    if not migrate_legacy_tasks(FILENAME):
+        sys.exit(1)
+    if args.add_manual:
+        sys.exit(add_manual_entry_headless(args))
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
     try:
-        curses.wrapper(run_tracker_app)
+        run_curses_app()
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
         print("Please ensure your terminal supports curses and is large enough.")
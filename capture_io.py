@@ -0,0 +1,113 @@
+import datetime
+import json
+import os
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+MANUAL_TIME_FORMATS = ("%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S")
+
+# Characters JSON leaves unescaped but YAML rejects or treats as line breaks.
+_YAML_UNSAFE = re.compile("[\x7f-\x9f\u2028\u2029\ufffe\uffff]")
+
+
+def ensure_data_file_exists(filename):
+    try:
+        fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        return
+    os.close(fd)
+
+
+def handle_sigterm(signum, frame):
+    raise SystemExit(0)
+
+
+def yaml_codec():
+    import yaml
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml import SafeLoader
+    return yaml, SafeLoader
+
+
+def json_dumps(obj):
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def json_loads(text):
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def format_task_line(task_entry):
+    line = _YAML_UNSAFE.sub(lambda m: f"\\u{ord(m.group()):04x}",
+                            json_dumps(task_entry).decode())
+    return "- " + line + "\n"
+
+
+def is_legacy_data(first_line):
+    first_line = first_line.strip()
+    return bool(first_line) and not first_line.startswith(b"- {")
+
+
+def _parse_fixed_dt(s):
+    if len(s) not in (16, 19):
+        return None
+    if (s[4], s[7], s[10], s[13]) != ("-", "-", " ", ":"):
+        return None
+    if len(s) == 19 and s[16] != ":":
+        return None
+    fields = (s[0:4], s[5:7], s[8:10], s[11:13], s[14:16], s[17:19] or "0")
+    if not all(field.isdigit() for field in fields):
+        return None
+    try:
+        return datetime.datetime(*map(int, fields))
+    except ValueError:
+        return None
+
+
+def parse_dt(s):
+    dt = _parse_fixed_dt(s)
+    if dt is not None:
+        return dt
+    # strptime also accepts unpadded fields such as "2025-6-3 9:05".
+    for fmt in MANUAL_TIME_FORMATS:
+        try:
+            return datetime.datetime.strptime(s, fmt)
+        except ValueError:
+            pass
+    return None
+
+
+def parse_manual_times(start_str, end_str):
+    start_dt = parse_dt(start_str)
+    end_dt = parse_dt(end_str)
+
+    if start_dt is None or end_dt is None:
+        raise ValueError(
+            "Invalid time format. Use YYYY-MM-DD HH:MM or YYYY-MM-DD HH:MM:S.")
+
+    if start_dt >= end_dt:
+        raise ValueError("Start time must be before end time.")
+
+    return start_dt, end_dt
+
+
+def make_manual_entry(task_info, start_dt, end_dt):
+    duration = (end_dt - start_dt).total_seconds()
+    return {
+        "type": task_info["type"],
+        "tag": task_info["tag"],
+        "name": task_info["name"],
+        "start": start_dt.isoformat(timespec='milliseconds'),
+        "end": end_dt.isoformat(timespec='milliseconds'),
+        "duration": round(duration, 3)
+    }
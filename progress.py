@@ -1,89 +1,241 @@
+import bisect
 import os
 import curses
-import yaml
+import functools
 import hashlib
-import math
+import signal
+import sys
 
-FILENAME = "progress-data.yaml"
+from capture_io import (ensure_data_file_exists, handle_sigterm, yaml_codec,
+                        json_dumps, json_loads)
 
+FILENAME = "progress-data.ndjson"
+LEGACY_FILENAMES = ("progress-data.json", "progress-data.yaml")
 
-def ensure_data_file_exists(filename):
-    if not os.path.exists(filename):
-        with open(filename, 'w') as f:
-            yaml.dump([], f)
+TITLE_LINE = "--- Task Progress Tracker ---"
+HEADER_LINE = "Hash      Type        Tag         Name"
+RULE_LINE = "--------------------------------------------------------------------"
+SEP_LINE = "--------------------"
+CMDS_LINE = "Commands: [i]nsert, [a]dd progress, [d]elete, [q]quit"
+PROMPT_LINE = "Enter command: "
+TASK_INFO_TEMPLATE = "%-6s %-12s %-12s %s"
 
+COMPACT_FACTOR = 2
 
-def load_tasks(filename, stdscr):
+_PRINTABLE = frozenset(range(32, 127))
+
+
+class Task:
+    __slots__ = ("hash", "type", "tag", "name", "total_digit",
+                 "current_progress")
+
+    def __init__(self, hash, type, tag, name, total_digit, current_progress=0):
+        self.hash = hash
+        self.type = type
+        self.tag = tag
+        self.name = name
+        self.total_digit = total_digit
+        self.current_progress = current_progress
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+def _load_legacy_file(legacy_filename):
+    if legacy_filename.endswith(".json"):
+        with open(legacy_filename, 'rb') as f:
+            data = f.read()
+        return json_loads(data) if data.strip() else []
+
+    yaml, SafeLoader = yaml_codec()
     try:
-        with open(filename, 'r') as f:
-            return yaml.safe_load(f) or []
-    except FileNotFoundError:
-        return []
+        with open(legacy_filename, 'rb') as f:
+            return yaml.load(f, Loader=SafeLoader) or []
     except yaml.YAMLError as e:
-        display_message(stdscr, f"Error loading YAML: {e}. Starting empty.")
-        return []
+        raise ValueError(e)
+
+
+def _snapshot_lines(task_dicts):
+    return b"".join(json_dumps({"op": "insert", **task}) + b"\n"
+                    for task in task_dicts)
+
+
+def migrate_legacy_tasks(filename):
+    # Returns False only when a legacy file exists but cannot be converted.
+    # No data file is created then, so the legacy file is kept and the next
+    # start tries again.
+    if os.path.exists(filename):
+        return True
+
+    for legacy_filename in LEGACY_FILENAMES:
+        if not os.path.exists(legacy_filename):
+            continue
+        temp_filename = filename + ".tmp"
+        try:
+            data = _snapshot_lines(_load_legacy_file(legacy_filename))
+            with open(temp_filename, 'wb') as f:
+                f.write(data)
+            os.replace(temp_filename, filename)
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Error migrating {legacy_filename}: {e}")
+            return False
+        return True
+    return True
+
+
+def _replay_op(tasks_by_hash, record):
+    if not isinstance(record, dict):
+        raise ValueError(f"expected a JSON object, got {record!r}")
+    op = record.pop("op")
+    if op == "insert":
+        tasks_by_hash.setdefault(record["hash"], []).append(Task(**record))
+    elif op == "update":
+        for task in tasks_by_hash.get(record["hash"], ()):
+            task.current_progress = record["current_progress"]
+    elif op == "delete":
+        tasks_by_hash.pop(record["hash"], None)
+
+
+def load_tasks(filename, stdscr, app_state):
+    # The data file is a log of insert/update/delete records, one JSON
+    # object per line, replayed in order. Returns the tasks and the number
+    # of records read.
+    tasks_by_hash = {}
+    log_lines = 0
+    try:
+        with open(filename, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                log_lines += 1
+                try:
+                    _replay_op(tasks_by_hash, json_loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    display_message(
+                        stdscr, app_state,
+                        f"Skipping unreadable task record: {e}")
+    except FileNotFoundError:
+        pass
+    tasks = [task for group in tasks_by_hash.values() for task in group]
+    return tasks, log_lines
 
 
-def save_tasks(filename, tasks, stdscr):
+def save_tasks(filename, tasks, stdscr, app_state):
+    temp_filename = filename + ".tmp"
     try:
-        with open(filename, 'w') as f:
-            yaml.dump(tasks, f, default_flow_style=False)
+        with open(temp_filename, 'wb') as f:
+            f.write(_snapshot_lines(task.as_dict() for task in tasks))
+        os.replace(temp_filename, filename)
     except Exception as e:
-        display_message(stdscr, f"Error saving tasks: {e}")
+        display_message(stdscr, app_state, f"Error saving tasks: {e}")
+        return False
+    return True
 
 
-def display_message(stdscr, message):
-    h, w = stdscr.getmaxyx()
+def append_ops(filename, ops, stdscr, app_state):
+    try:
+        with open(filename, 'ab') as f:
+            f.write(b"".join(json_dumps(op) + b"\n" for op in ops))
+    except Exception as e:
+        display_message(stdscr, app_state, f"Error saving tasks: {e}")
+        return False
+    return True
+
+
+def record_op(stdscr, app_state, op):
+    app_state["pending_ops"].append(op)
+    flush_tasks(stdscr, app_state)
+
+
+def flush_tasks(stdscr, app_state):
+    # Ops that failed to write stay pending and are retried with the next.
+    pending_ops = app_state["pending_ops"]
+    if not pending_ops:
+        return
+
+    tasks = app_state["tasks"]
+    log_lines = app_state["log_lines"] + len(pending_ops)
+    if log_lines > COMPACT_FACTOR * len(tasks):
+        if save_tasks(FILENAME, tasks, stdscr, app_state):
+            app_state["log_lines"] = len(tasks)
+            app_state["pending_ops"] = []
+    elif append_ops(FILENAME, pending_ops, stdscr, app_state):
+        app_state["log_lines"] = log_lines
+        app_state["pending_ops"] = []
+
+
+def display_message(stdscr, app_state, message):
+    h, w = app_state["screen_size"]
     message_line = h - 5
     stdscr.move(message_line, 0)
     stdscr.clrtoeol()
     stdscr.addstr(message_line, 0, message[:w-1])
-    stdscr.refresh()
+    stdscr.noutrefresh()
+    curses.doupdate()
 
 
-def get_curses_input(stdscr, prompt_line, prompt_col, prompt_text=""):
+def get_curses_input(stdscr, app_state, prompt_line, prompt_col,
+                     prompt_text=""):
     stdscr.move(prompt_line, prompt_col)
     stdscr.clrtoeol()
     stdscr.addstr(prompt_line, prompt_col, prompt_text)
-    stdscr.refresh()
 
-    input_str = []
-    curses.echo()
+    input_buf = bytearray()
     curses.curs_set(1)
 
-    current_col = prompt_col + len(prompt_text)
-    stdscr.move(prompt_line, current_col)
+    input_col = prompt_col + len(prompt_text)
+    max_len = app_state["screen_size"][1] - 1 - input_col
+    stdscr.move(prompt_line, input_col)
+    stdscr.noutrefresh()
+    curses.doupdate()
 
-    while True:
+    done = False
+    while not done:
         char_code = stdscr.getch()
-        if char_code == curses.KEY_ENTER or char_code in [10, 13]:
-            break
-        elif char_code == curses.KEY_BACKSPACE or char_code == 127:
-            if input_str:
-                input_str.pop()
-                current_col -= 1
-                stdscr.delch(prompt_line, current_col)
-        elif 32 <= char_code <= 126:
-            if current_col < stdscr.getmaxyx()[1] - 1:
-                input_str.append(chr(char_code))
-                stdscr.addch(prompt_line, current_col, char_code)
-                current_col += 1
-        stdscr.refresh()
+        if char_code == -1:
+            continue
+
+        # Consume everything already queued (e.g. a paste) before redrawing.
+        changed = False
+        stdscr.timeout(0)
+        while char_code != -1:
+            if char_code == curses.KEY_ENTER or char_code in [10, 13]:
+                done = True
+                break
+            elif char_code == curses.KEY_RESIZE:
+                app_state["screen_size"] = stdscr.getmaxyx()
+            elif char_code == curses.KEY_BACKSPACE or char_code == 127:
+                if input_buf:
+                    del input_buf[-1]
+                    changed = True
+            elif char_code in _PRINTABLE:
+                if len(input_buf) < max_len:
+                    input_buf.append(char_code)
+                    changed = True
+            char_code = stdscr.getch()
+        stdscr.timeout(-1)
+
+        if changed:
+            stdscr.move(prompt_line, input_col)
+            stdscr.clrtoeol()
+            stdscr.addstr(prompt_line, input_col, input_buf.decode('ascii'))
+            stdscr.noutrefresh()
+            curses.doupdate()
 
-    curses.noecho()
     curses.curs_set(0)
-    return "".join(input_str)
+    return input_buf.decode('ascii')
 
 
+@functools.lru_cache(maxsize=4096)
 def generate_task_hash(task_type, task_tag, task_name):
     combined_string = f"{task_type}{task_tag}{task_name}"
-    hash_object = hashlib.md5(combined_string.encode())
-    hex_digest = hash_object.hexdigest()
-    numeric_hash = int(hex_digest, 16) % 1_000_000
+    digest = hashlib.md5(combined_string.encode()).digest()
+    numeric_hash = int.from_bytes(digest, 'big') % 1_000_000
     return f"{numeric_hash:06d}"
 
 
-def draw_progress_bar(stdscr, current, total, display_width):
+@functools.lru_cache(maxsize=1024)
+def _render_bar(current, total, display_width):
     if total == 0:
         percentage = 0
     else:
@@ -97,12 +249,12 @@ def draw_progress_bar(stdscr, current, total, display_width):
     if bar_length < 10:
         bar_length = 10
 
-    filled_length = math.floor(bar_length * percentage / 100)
-    bar = fill_char * filled_length
+    filled_length = int(bar_length * percentage / 100)
     if filled_length < bar_length:
-        bar += ">"
-    bar = bar[:bar_length]
-    bar += empty_char * (bar_length - len(bar))
+        bar = (fill_char * filled_length + ">"
+               + empty_char * (bar_length - filled_length - 1))
+    else:
+        bar = fill_char * bar_length
 
     progress_text = f"{current}/{total} ({percentage:.0f}%)"
     display_str = f"[{bar}] {progress_text}"
@@ -110,50 +262,66 @@ def draw_progress_bar(stdscr, current, total, display_width):
     return display_str[:display_width]
 
 
-def display_tasks(stdscr, tasks):
-    h, w = stdscr.getmaxyx()
-
-    for r in range(0, h):
-        stdscr.move(r, 0)
-        stdscr.clrtoeol()
-
-    stdscr.addstr(0, 0, "--- Task Progress Tracker ---")
-    stdscr.addstr(1, 0, "Hash      Type        Tag         Name")
-    stdscr.addstr(
-        2, 0, "--------------------------------------------------------------------")
+def build_frame(tasks, h, w):
+    rows = [""] * h
+    rows[0] = TITLE_LINE
+    rows[1] = HEADER_LINE
+    rows[2] = RULE_LINE
 
     start_line = 3
     max_tasks_display = (h - start_line - 6) // 2
 
+    fixed_info_width = 6 + 1 + 12 + 1 + 12 + 1
+    name_width = w - fixed_info_width - 1
+
     for i, task in enumerate(tasks):
         if i >= max_tasks_display:
             break
         task_line = start_line + i * 2
         progress_line = task_line + 1
 
-        fixed_info_width = 6 + 1 + 12 + 1 + 12 + 1
-        task_info = f"{task['hash']:<6} {task['type']:<12} {
-            task['tag']:<12} {task['name'][:w-fixed_info_width-1]}"
-        stdscr.addstr(task_line, 0, task_info)
+        rows[task_line] = TASK_INFO_TEMPLATE % (
+            task.hash, task.type, task.tag, task.name[:name_width])
+        rows[progress_line] = _render_bar(
+            task.current_progress, task.total_digit, w)
+
+    rows[h - 3] = SEP_LINE
+    rows[h - 2] = CMDS_LINE
+    rows[h - 1] = PROMPT_LINE
+    return rows
+
 
-        progress_str = draw_progress_bar(
-            stdscr, task['current_progress'], task['total_digit'], w)
-        stdscr.addstr(progress_line, 0, progress_str)
+def display_tasks(stdscr, app_state):
+    h, w = app_state["screen_size"]
+    frame_cache = app_state["frame_cache"]
+    if app_state["frame_size"] != (h, w):
+        app_state["frame_size"] = (h, w)
+        frame_cache.clear()
+        stdscr.erase()
 
-    stdscr.addstr(h - 3, 0, "--------------------")
-    stdscr.addstr(
-        h - 2, 0, "Commands: [i]nsert, [a]dd progress, [d]elete, [q]quit")
-    stdscr.addstr(h - 1, 0, "Enter command: ")
+    for r, text in enumerate(build_frame(app_state["tasks"], h, w)):
+        text = text[:w-1]
+        if frame_cache.get(r) != text:
+            stdscr.move(r, 0)
+            stdscr.clrtoeol()
+            stdscr.addstr(r, 0, text)
+            frame_cache[r] = text
 
-    stdscr.move(h - 1, len("Enter command: "))
-    stdscr.refresh()
+    stdscr.move(h - 1, len(PROMPT_LINE))
+    stdscr.noutrefresh()
+    curses.doupdate()
 
 
-def find_task_by_hash_prefix(tasks, hash_prefix):
-    matches = []
-    for task in tasks:
-        if task['hash'].startswith(hash_prefix):
-            matches.append(task)
+def build_hash_index(tasks):
+    return sorted((task.hash, i) for i, task in enumerate(tasks))
+
+
+def find_task_by_hash_prefix(app_state, hash_prefix):
+    tasks = app_state["tasks"]
+    hash_index = app_state["hash_index"]
+    lo = bisect.bisect_left(hash_index, (hash_prefix,))
+    hi = bisect.bisect_left(hash_index, (hash_prefix + "\uffff",))
+    matches = [tasks[i] for _, i in hash_index[lo:hi]]
 
     if len(matches) == 1:
         return matches[0]
@@ -163,27 +331,47 @@ def find_task_by_hash_prefix(tasks, hash_prefix):
         return None
 
 
-def clear_input_area(stdscr):
-    h, w = stdscr.getmaxyx()
-    for i in range(h - 6, h):
-        stdscr.move(i, 0)
-        stdscr.clrtoeol()
+def remove_task(app_state, task_hash):
+    tasks = app_state["tasks"]
+    hash_index = app_state["hash_index"]
+    lo = bisect.bisect_left(hash_index, (task_hash,))
+    hi = bisect.bisect_left(hash_index, (task_hash + "\0",))
+    positions = [i for _, i in hash_index[lo:hi]]
+
+    for i in reversed(positions):
+        del tasks[i]
+    # Later positions shift down by the number of removed tasks before them;
+    # the index stays sorted, so no re-sort is needed.
+    app_state["hash_index"] = [
+        (h, i - bisect.bisect_left(positions, i))
+        for h, i in hash_index[:lo] + hash_index[hi:]]
+    app_state["by_hash"].pop(task_hash, None)
+
+
+def clear_input_area(stdscr, h):
+    # The input area is the bottom six rows, so one clrtobot covers it.
+    stdscr.move(h - 6, 0)
+    stdscr.clrtobot()
 
 
 def handle_insert_task(stdscr, app_state):
-    h, w = stdscr.getmaxyx()
-    clear_input_area(stdscr)
+    h, w = app_state["screen_size"]
+    clear_input_area(stdscr, h)
 
     stdscr.addstr(h - 6, 0, "Enter task details (press Enter after each):")
-    stdscr.refresh()
-
-    task_type = get_curses_input(stdscr, h - 5, 0, "Task Type: ").strip()
-    task_tag = get_curses_input(stdscr, h - 4, 0, "Task Tag: ").strip()
-    task_name = get_curses_input(stdscr, h - 3, 0, "Task Name: ").strip()
+    stdscr.noutrefresh()
+
+    task_type = get_curses_input(
+        stdscr, app_state, h - 5, 0, "Task Type: ").strip()
+    task_tag = get_curses_input(
+        stdscr, app_state, h - 4, 0, "Task Tag: ").strip()
+    task_name = get_curses_input(
+        stdscr, app_state, h - 3, 0, "Task Name: ").strip()
     task_digit_str = get_curses_input(
-        stdscr, h - 2, 0, "Total Digit (e.g., 100): ").strip()
+        stdscr, app_state, h - 2, 0, "Total Digit (e.g., 100): ").strip()
     if not (task_type and task_tag and task_name and task_digit_str):
-        display_message(stdscr, "Error: All task fields must be filled.")
+        display_message(stdscr, app_state,
+                        "Error: All task fields must be filled.")
         curses.napms(1500)
         return
 
@@ -191,59 +379,56 @@ def handle_insert_task(stdscr, app_state):
         total_digit = int(task_digit_str)
         if total_digit <= 0:
             display_message(
-                stdscr, "Error: Total Digit must be a positive integer.")
+                stdscr, app_state, "Error: Total Digit must be a positive integer.")
             curses.napms(1500)
             return
     except ValueError:
-        display_message(stdscr, "Error: Total Digit must be an integer.")
+        display_message(stdscr, app_state,
+                        "Error: Total Digit must be an integer.")
         curses.napms(1500)
         return
 
     new_hash = generate_task_hash(task_type, task_tag, task_name)
-    for task in app_state["tasks"]:
-        if task["hash"] == new_hash:
-            display_message(
-                stdscr, f"Warning: A task with identical details already exists (Hash: {new_hash}).")
-            curses.napms(1500)
-            return
+    if new_hash in app_state["by_hash"]:
+        display_message(
+            stdscr, app_state, f"Warning: A task with identical details already exists (Hash: {new_hash}).")
+        curses.napms(1500)
+        return
 
-    new_task = {
-        "hash": new_hash,
-        "type": task_type,
-        "tag": task_tag,
-        "name": task_name,
-        "total_digit": total_digit,
-        "current_progress": 0
-    }
+    new_task = Task(new_hash, task_type, task_tag, task_name, total_digit)
     app_state["tasks"].append(new_task)
-    save_tasks(FILENAME, app_state["tasks"], stdscr)
-    display_message(stdscr, f"Task '{task_name}' added with hash {new_hash}.")
+    app_state["by_hash"][new_hash] = new_task
+    app_state["hash_index"] = build_hash_index(app_state["tasks"])
+    record_op(stdscr, app_state, {"op": "insert", **new_task.as_dict()})
+    display_message(stdscr, app_state,
+                    f"Task '{task_name}' added with hash {new_hash}.")
     curses.napms(1500)
 
 
 def handle_add_progress(stdscr, app_state):
-    h, w = stdscr.getmaxyx()
-    clear_input_area(stdscr)
+    h, w = app_state["screen_size"]
+    clear_input_area(stdscr, h)
 
     hash_input = get_curses_input(
-        stdscr, h - 3, 0, "Enter task hash (partial allowed): ").strip()
+        stdscr, app_state, h - 3, 0, "Enter task hash (partial allowed): ").strip()
     change_str = get_curses_input(
-        stdscr, h - 2, 0, "Enter change (+N, -N): ").strip()
+        stdscr, app_state, h - 2, 0, "Enter change (+N, -N): ").strip()
 
     if not (hash_input and change_str):
         display_message(
-            stdscr, "Error: Hash and change value cannot be empty.")
+            stdscr, app_state, "Error: Hash and change value cannot be empty.")
         curses.napms(1500)
         return
 
-    matched_task = find_task_by_hash_prefix(app_state["tasks"], hash_input)
+    matched_task = find_task_by_hash_prefix(app_state, hash_input)
 
     if matched_task is None:
-        display_message(stdscr, f"No task found for hash '{hash_input}'.")
+        display_message(stdscr, app_state,
+                        f"No task found for hash '{hash_input}'.")
         curses.napms(1500)
         return
     elif isinstance(matched_task, list):
-        display_message(stdscr, f"Ambiguous hash '{
+        display_message(stdscr, app_state, f"Ambiguous hash '{
                         hash_input}'. Matches multiple tasks. Be more specific.")
         curses.napms(1500)
         return
@@ -252,93 +437,120 @@ def handle_add_progress(stdscr, app_state):
         change_amount = int(change_str)
     except ValueError:
         display_message(
-            stdscr, "Error: Change amount must be an integer (e.g., +5, -2).")
+            stdscr, app_state, "Error: Change amount must be an integer (e.g., +5, -2).")
         curses.napms(1500)
         return
 
-    matched_task['current_progress'] += change_amount
-    if matched_task['current_progress'] < 0:
-        matched_task['current_progress'] = 0
-    if matched_task['current_progress'] > matched_task['total_digit']:
-        matched_task['current_progress'] = matched_task['total_digit']
-
-    save_tasks(FILENAME, app_state["tasks"], stdscr)
-    display_message(stdscr, f"Progress updated for '{
-                    matched_task['name']}' (Hash: {matched_task['hash']}).")
+    matched_task.current_progress += change_amount
+    if matched_task.current_progress < 0:
+        matched_task.current_progress = 0
+    if matched_task.current_progress > matched_task.total_digit:
+        matched_task.current_progress = matched_task.total_digit
+
+    record_op(stdscr, app_state, {
+        "op": "update", "hash": matched_task.hash,
+        "current_progress": matched_task.current_progress})
+    display_message(stdscr, app_state, f"Progress updated for '{
+                    matched_task.name}' (Hash: {matched_task.hash}).")
     curses.napms(1500)
 
 
 def handle_delete_task(stdscr, app_state):
-    h, w = stdscr.getmaxyx()
-    clear_input_area(stdscr)
+    h, w = app_state["screen_size"]
+    clear_input_area(stdscr, h)
 
     hash_input = get_curses_input(
-        stdscr, h - 2, 0, "Enter task hash to delete (partial allowed): ").strip()
+        stdscr, app_state, h - 2, 0, "Enter task hash to delete (partial allowed): ").strip()
 
     if not hash_input:
-        display_message(stdscr, "Error: Hash cannot be empty.")
+        display_message(stdscr, app_state, "Error: Hash cannot be empty.")
         curses.napms(1500)
         return
 
-    matched_task = find_task_by_hash_prefix(app_state["tasks"], hash_input)
+    matched_task = find_task_by_hash_prefix(app_state, hash_input)
 
     if matched_task is None:
-        display_message(stdscr, f"No task found for hash '{hash_input}'.")
+        display_message(stdscr, app_state,
+                        f"No task found for hash '{hash_input}'.")
         curses.napms(1500)
         return
     elif isinstance(matched_task, list):
-        display_message(stdscr, f"Ambiguous hash '{
+        display_message(stdscr, app_state, f"Ambiguous hash '{
                         hash_input}'. Matches multiple tasks. Be more specific.")
         curses.napms(1500)
         return
 
-    app_state["tasks"] = [t for t in app_state["tasks"]
-                          if t["hash"] != matched_task["hash"]]
-    save_tasks(FILENAME, app_state["tasks"], stdscr)
-    display_message(stdscr, f"Task '{matched_task['name']}' (Hash: {
-                    matched_task['hash']}) deleted.")
+    remove_task(app_state, matched_task.hash)
+    record_op(stdscr, app_state, {"op": "delete", "hash": matched_task.hash})
+    display_message(stdscr, app_state, f"Task '{matched_task.name}' (Hash: {
+                    matched_task.hash}) deleted.")
     curses.napms(1500)
 
 
 def run_tracker_app(stdscr):
     app_state = {
-        "tasks": []
+        "tasks": [],
+        "hash_index": [],
+        "by_hash": {},
+        "frame_cache": {},
+        "frame_size": None,
+        "screen_size": stdscr.getmaxyx(),
+        "log_lines": 0,
+        "pending_ops": []
     }
 
     curses.noecho()
     curses.cbreak()
-    stdscr.nodelay(True)
-    stdscr.timeout(100)
-
-    app_state["tasks"] = load_tasks(FILENAME, stdscr)
-
-    while True:
-        display_tasks(stdscr, app_state["tasks"])
-        key = stdscr.getch()
-
-        if key != -1:
-            command = chr(key).lower()
-
-            if command == 'i':
-                handle_insert_task(stdscr, app_state)
-            elif command == 'a':
-                handle_add_progress(stdscr, app_state)
-            elif command == 'd':
-                handle_delete_task(stdscr, app_state)
-            elif command == 'q':
-                display_message(stdscr, "Quitting program. Goodbye!")
-                curses.napms(1000)
-                break
-            else:
-                display_message(stdscr, f"Invalid command '{
-                                command}'. Use i, a, d, q.")
-                curses.napms(1500)
+    stdscr.nodelay(False)
 
-        curses.napms(50)
+    app_state["tasks"], app_state["log_lines"] = load_tasks(
+        FILENAME, stdscr, app_state)
+    app_state["by_hash"] = {task.hash: task for task in app_state["tasks"]}
+    app_state["hash_index"] = build_hash_index(app_state["tasks"])
+
+    dirty = True
+    try:
+        while True:
+            if dirty:
+                display_tasks(stdscr, app_state)
+                dirty = False
+            key = stdscr.getch()
+
+            if key == curses.KEY_RESIZE:
+                app_state["screen_size"] = stdscr.getmaxyx()
+                dirty = True
+            elif key != -1:
+                command = chr(key).lower()
+
+                if command == 'i':
+                    handle_insert_task(stdscr, app_state)
+                elif command == 'a':
+                    handle_add_progress(stdscr, app_state)
+                elif command == 'd':
+                    handle_delete_task(stdscr, app_state)
+                elif command == 'q':
+                    display_message(stdscr, app_state,
+                                    "Quitting program. Goodbye!")
+                    curses.napms(1000)
+                    break
+                else:
+                    display_message(stdscr, app_state, f"Invalid command '{
+                                    command}'. Use i, a, d, q.")
+                    curses.napms(1500)
+
+                # Handlers draw prompts and messages over the frame; a resize
+                # they consume while waiting for input updates screen_size.
+                app_state["frame_cache"].clear()
+                dirty = True
+    finally:
+        flush_tasks(stdscr, app_state)
 
 
 if __name__ == "__main__":
+    if not migrate_legacy_tasks(FILENAME):
+        sys.exit(1)
     ensure_data_file_exists(FILENAME)
+    signal.signal(signal.SIGTERM, handle_sigterm)
     try:
         curses.wrapper(run_tracker_app)
     except Exception as e: